@@ -7,26 +7,76 @@ import logging
 import math
 import pathlib
 import random
-import time
+import string
 import uuid
-from dataclasses import dataclass
+import weakref
+from typing import Optional
 
 import ifcopenshell
 import ifcopenshell.guid
 import ifcopenshell.validate
 
+# number of 16-byte uuids drawn per entropy refill
+_ENTROPY_POOL_SIZE = 4096
+
+# owner history creation date: 2025-01-01T00:00:00Z (fixed, independent of the local time zone)
+_CREATION_DATE = 1735689600
+
+# one degree, in radians
+_DEG_IN_RAD = math.pi / 180.
+
+# points of interest of the world coordinate system
+_ORIGIN = 0., 0., 0.
+_XDIR = 1., 0., 0.
+_ZDIR = 0., 0., 1.
+
+# ifc guid alphabet (see ifcopenshell.guid), and every 12-bit value as its two guid characters
+_GUID_CHARS = string.digits + string.ascii_uppercase + string.ascii_lowercase + '_$'
+_GUID_PAIRS = [a + b for a in _GUID_CHARS for b in _GUID_CHARS]
+
+
+def _compress_guid_bytes(b: bytes) -> str:
+    """
+    Same encoding as ifcopenshell.guid.compress, but straight from the 16 uuid bytes
+    (no hex round-trip): the first byte becomes 2 characters, each following 3 bytes become 4.
+    """
+    return ''.join((
+        _GUID_PAIRS[b[0]],
+        _GUID_PAIRS[(b[1] << 4) | (b[2] >> 4)], _GUID_PAIRS[((b[2] & 0xF) << 8) | b[3]],
+        _GUID_PAIRS[(b[4] << 4) | (b[5] >> 4)], _GUID_PAIRS[((b[5] & 0xF) << 8) | b[6]],
+        _GUID_PAIRS[(b[7] << 4) | (b[8] >> 4)], _GUID_PAIRS[((b[8] & 0xF) << 8) | b[9]],
+        _GUID_PAIRS[(b[10] << 4) | (b[11] >> 4)], _GUID_PAIRS[((b[11] & 0xF) << 8) | b[12]],
+        _GUID_PAIRS[(b[13] << 4) | (b[14] >> 4)], _GUID_PAIRS[((b[14] & 0xF) << 8) | b[15]],
+    ))
+
 
-@dataclass
 class GuidGenerator:
-    seed: int = 42
+    __slots__ = ('seed', '_random_device', '_entropy', '_cursor')
 
-    def __post_init__(self) -> None:
+    def __init__(self, seed: int = 42) -> None:
+        self.seed = seed
         self._random_device = random.Random()
         self._random_device.seed(self.seed)
+        self._refill_entropy()
+
+    def _refill_entropy(self) -> None:
+        self._entropy = bytearray(self._random_device.randbytes(16 * _ENTROPY_POOL_SIZE))
+        self._cursor = 0
 
     def _next_consistent_uuid_seed(self) -> int:
         return self._random_device.getrandbits(128)
 
+    def _next_consistent_uuid4_bytes(self) -> bytearray:
+        if self._cursor == len(self._entropy):
+            self._refill_entropy()
+        c = self._cursor
+        buf = self._entropy[c:c + 16]
+        self._cursor = c + 16
+        # stamp version (4) and variant (RFC 4122) bits
+        buf[6] = (buf[6] & 0x0F) | 0x40
+        buf[8] = (buf[8] & 0x3F) | 0x80
+        return buf
+
     def new_random_uuid1_guid(self) -> str:
         return ifcopenshell.guid.compress(uuid.uuid1().hex)
 
@@ -37,76 +87,92 @@ class GuidGenerator:
         return ifcopenshell.guid.compress(uuid.uuid4().hex)
 
     def new_consistent_uuid4_guid(self) -> str:
-        return ifcopenshell.guid.compress(uuid.UUID(int=self._next_consistent_uuid_seed(), version=4).hex)
+        return _compress_guid_bytes(self._next_consistent_uuid4_bytes())
+
+    def new_consistent_uuid4_guids(self, count: int) -> list[str]:
+        return [_compress_guid_bytes(self._next_consistent_uuid4_bytes()) for _ in range(count)]
+
+
+_guid_generator = GuidGenerator()
+new_host_guid = _guid_generator.new_consistent_uuid4_guid
+new_host_guids = _guid_generator.new_consistent_uuid4_guids
 
+# STEP text of the file created by create_base_file, filled on first use
+_TEMPLATE_CACHE: Optional[str] = None
 
-new_host_guid = GuidGenerator().new_consistent_uuid1_guid
+# per-file memo of shareable instances, dropped together with its file
+_file_caches: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _file_cache(ifc_file: ifcopenshell.file) -> dict:
+    return _file_caches.setdefault(ifc_file, {})
 
 
 def add_owner(ifc_file: ifcopenshell.file) -> ifcopenshell.entity_instance:
     # ifc organization
-    org = ifc_file.createIfcOrganization()
-    org.Name = 'SWAPP.ai'
+    org = ifc_file.createIfcOrganization(Name='SWAPP.ai')
 
     # ifc application
-    app = ifc_file.createIfcApplication()
-    app.ApplicationDeveloper = org
-    app.Version = '0.1.0'
-    app.ApplicationFullName = 'IFC Documentation Examples'
-    app.ApplicationIdentifier = 'IFC Documentation Example'
+    app = ifc_file.createIfcApplication(
+        ApplicationDeveloper=org,
+        Version='0.1.0',
+        ApplicationFullName='IFC Documentation Examples',
+        ApplicationIdentifier='IFC Documentation Example',
+    )
 
     # ifc owner
-    author = ifc_file.createIfcPerson()
-    author.GivenName = 'Example'
+    author = ifc_file.createIfcPerson(GivenName='Example')
 
     # ifc owner and organization
-    author_and_org = ifc_file.createIfcPersonAndOrganization()
-    author_and_org.ThePerson = author
-    author_and_org.TheOrganization = org
+    author_and_org = ifc_file.createIfcPersonAndOrganization(ThePerson=author, TheOrganization=org)
 
     # owner history
-    owner_hist = ifc_file.createIfcOwnerHistory()
-    owner_hist.OwningUser = author_and_org
-    owner_hist.OwningApplication = app
-    owner_hist.CreationDate = int(time.mktime((2025, 1, 1, 0, 0, 0, 0, 0, 0)))
+    owner_hist = ifc_file.createIfcOwnerHistory(
+        OwningUser=author_and_org,
+        OwningApplication=app,
+        CreationDate=_CREATION_DATE,
+    )
 
     return owner_hist
 
 
+def get_dimensionless_exponents(ifc_file: ifcopenshell.file) -> ifcopenshell.entity_instance:
+    # IfcDimensionalExponents(0, ..., 0), shared by every dimensionless unit of the file
+    cache = _file_cache(ifc_file)
+    exponents = cache.get('IfcDimensionalExponents')
+    if exponents is None:
+        exponents = cache['IfcDimensionalExponents'] = ifc_file.createIfcDimensionalExponents(0, 0, 0, 0, 0, 0, 0)
+    return exponents
+
+
 def add_units(ifc_file: ifcopenshell.file) -> ifcopenshell.entity_instance:
     # ifc units (metric)
 
     ## length
-    length_unit = ifc_file.createIfcSIUnit()
-    length_unit.UnitType = "LENGTHUNIT"
-    length_unit.Name = "METRE"
+    length_unit = ifc_file.createIfcSIUnit(UnitType="LENGTHUNIT", Name="METRE")
 
     ## area
-    area_unit = ifc_file.createIfcSIUnit()
-    area_unit.UnitType = "AREAUNIT"
-    area_unit.Name = "SQUARE_METRE"
+    area_unit = ifc_file.createIfcSIUnit(UnitType="AREAUNIT", Name="SQUARE_METRE")
 
     ## volume
-    volume_unit = ifc_file.createIfcSIUnit()
-    volume_unit.UnitType = "VOLUMEUNIT"
-    volume_unit.Name = "CUBIC_METRE"
+    volume_unit = ifc_file.createIfcSIUnit(UnitType="VOLUMEUNIT", Name="CUBIC_METRE")
 
     ## plane
-    plane_angle_unit = ifc_file.createIfcSIUnit()
-    plane_angle_unit.UnitType = "PLANEANGLEUNIT"
-    plane_angle_unit.Name = "RADIAN"
+    plane_angle_unit = ifc_file.createIfcSIUnit(UnitType="PLANEANGLEUNIT", Name="RADIAN")
 
     ## angle
-    angle_unit = ifc_file.createIfcMeasureWithUnit()
-    angle_unit.UnitComponent = plane_angle_unit
-    angle_unit.ValueComponent = ifc_file.createIfcPlaneAngleMeasure(math.pi / 180)
+    angle_unit = ifc_file.createIfcMeasureWithUnit(
+        ValueComponent=ifc_file.createIfcPlaneAngleMeasure(_DEG_IN_RAD),
+        UnitComponent=plane_angle_unit,
+    )
 
     ## convert base units
-    convert_base_unit = ifc_file.createIfcConversionBasedUnit()
-    convert_base_unit.Dimensions = ifc_file.createIfcDimensionalExponents(0, 0, 0, 0, 0, 0, 0)
-    convert_base_unit.UnitType = "PLANEANGLEUNIT"
-    convert_base_unit.Name = "DEGREE"
-    convert_base_unit.ConversionFactor = angle_unit
+    convert_base_unit = ifc_file.createIfcConversionBasedUnit(
+        Dimensions=get_dimensionless_exponents(ifc_file),
+        UnitType="PLANEANGLEUNIT",
+        Name="DEGREE",
+        ConversionFactor=angle_unit,
+    )
 
     ## unit assignment
     unit_assignment = ifc_file.createIfcUnitAssignment([length_unit, area_unit, volume_unit, convert_base_unit])
@@ -117,30 +183,23 @@ def add_units(ifc_file: ifcopenshell.file) -> ifcopenshell.entity_instance:
 def add_default_geometry_context(ifc_file: ifcopenshell.file) -> ifcopenshell.entity_instance:
     # ifc geometries
 
-    ## points of interest
-    o = 0., 0., 0.
-    x = 1., 0., 0.
-    z = 0., 0., 1.
-
     ## axes
-    xaxis = ifc_file.createIfcDirection(x)
-    zaxis = ifc_file.createIfcDirection(z)
+    xaxis = ifc_file.createIfcDirection(_XDIR)
+    zaxis = ifc_file.createIfcDirection(_ZDIR)
 
     ## origin
-    origin = ifc_file.createIfcCartesianPoint(o)
+    origin = ifc_file.createIfcCartesianPoint(_ORIGIN)
 
     ## coordinate system (top-down view along z-axis)
-    world_coordinate_system = ifc_file.createIfcAxis2Placement3D()
-    world_coordinate_system.Location = origin
-    world_coordinate_system.Axis = zaxis
-    world_coordinate_system.RefDirection = xaxis
+    world_coordinate_system = ifc_file.createIfcAxis2Placement3D(Location=origin, Axis=zaxis, RefDirection=xaxis)
 
     ## geometry context
-    geom_context = ifc_file.createIfcGeometricRepresentationContext()
-    geom_context.ContextType = 'Model'
-    geom_context.CoordinateSpaceDimension = 3
-    geom_context.Precision = 1.e-05
-    geom_context.WorldCoordinateSystem = world_coordinate_system
+    geom_context = ifc_file.createIfcGeometricRepresentationContext(
+        ContextType='Model',
+        CoordinateSpaceDimension=3,
+        Precision=1.e-05,
+        WorldCoordinateSystem=world_coordinate_system,
+    )
 
     return geom_context
 
@@ -159,7 +218,38 @@ def add_project(ifc_file: ifcopenshell.file,
     return project
 
 
-def add_properties(ifc_file, element, properties_dict, property_set_name="DocumentationObjectProperties"):
+# python type -> IfcValue subtype (looked up by type() first, so bool is not taken for int)
+_VALUE_TYPE = {str: "IfcText", bool: "IfcBoolean", int: "IfcInteger", float: "IfcReal"}
+
+
+def get_value_instance(ifc_file, value):
+    """
+    Returns the IfcValue instance for a python value, shared by every property holding the same value.
+
+    Args:
+        ifc_file: The IFC file object.
+        value: A str, bool, int or float (or an instance of a subclass of one).
+    """
+    # Determine the appropriate IfcValue subtype
+    typename = _VALUE_TYPE.get(type(value))
+    if typename is None:
+        # subclasses (e.g. numpy.float64, str enums) take the type of their nearest supported base
+        typename = next((_VALUE_TYPE[base] for base in type(value).__mro__ if base in _VALUE_TYPE), None)
+        if typename is None:
+            raise ValueError(f"Unsupported value type: {type(value)}")
+
+    # Reuse the value instance across property sets (e.g. the repeated "type" tags);
+    # floats are keyed by their exact bits, as equality would merge -0.0 into 0.0
+    key = typename, value.hex() if typename == "IfcReal" else value
+    value_cache = _file_cache(ifc_file)
+    value_instance = value_cache.get(key)
+    if value_instance is None:
+        value_instance = value_cache[key] = ifc_file.create_entity(typename, value)
+    return value_instance
+
+
+def add_properties(ifc_file, element, properties_dict, property_set_name="DocumentationObjectProperties",
+                   guid_fn=new_host_guid):
     """
     Adds a property set with multiple key-value pairs to the given IFC element.
 
@@ -168,32 +258,22 @@ def add_properties(ifc_file, element, properties_dict, property_set_name="Docume
         element: The IFC element to which the property set will be attached.
         properties_dict: A dictionary containing key-value pairs.
         property_set_name: The name of the property set.
+        guid_fn: Returns a new GlobalId for each of the two created rooted entities.
     """
-    property_list = []
-
-    for key, value in properties_dict.items():
-        # Determine the appropriate IfcValue subtype
-        if isinstance(value, str):
-            value_instance = ifc_file.create_entity("IfcText", value)
-        elif isinstance(value, int):
-            value_instance = ifc_file.create_entity("IfcInteger", value)
-        elif isinstance(value, float):
-            value_instance = ifc_file.create_entity("IfcReal", value)
-        else:
-            raise ValueError(f"Unsupported value type: {type(value)}")
-
-        # Create an IfcPropertySingleValue for each key-value pair
-        property_single_value = ifc_file.createIfcPropertySingleValue(
+    # Create an IfcPropertySingleValue for each key-value pair
+    property_list = [
+        ifc_file.createIfcPropertySingleValue(
             Name=key,
             Description=None,
-            NominalValue=value_instance,
+            NominalValue=get_value_instance(ifc_file, value),
             Unit=None,
         )
-        property_list.append(property_single_value)
+        for key, value in properties_dict.items()
+    ]
 
     # Create the property set with all properties
     property_set = ifc_file.createIfcPropertySet(
-        GlobalId=ifcopenshell.guid.new(),
+        GlobalId=guid_fn(),
         OwnerHistory=None,
         Name=property_set_name,
         Description=None,
@@ -202,7 +282,7 @@ def add_properties(ifc_file, element, properties_dict, property_set_name="Docume
 
     # Create the relationship between the element and the property set
     ifc_file.createIfcRelDefinesByProperties(
-        GlobalId=ifcopenshell.guid.new(),
+        GlobalId=guid_fn(),
         OwnerHistory=None,
         Name=None,
         Description=None,
@@ -211,19 +291,84 @@ def add_properties(ifc_file, element, properties_dict, property_set_name="Docume
     )
 
 
+def add_properties_bulk(ifc_file, element_properties, property_set_name="DocumentationObjectProperties"):
+    """
+    Adds one property set per element, see add_properties.
+
+    Args:
+        ifc_file: The IFC file object.
+        element_properties: A list of (element, properties dictionary) pairs.
+        property_set_name: The name of the property sets.
+    """
+    # two GlobalIds (property set + relationship) per element, drawn at once
+    guids = iter(new_host_guids(2 * len(element_properties)))
+    for element, properties_dict in element_properties:
+        add_properties(ifc_file, element, properties_dict, property_set_name, guid_fn=guids.__next__)
+
+
+def add_aggregates(ifc_file, edges, guids):
+    """
+    Creates one IfcRelAggregates per (parent, children) edge.
+
+    Args:
+        ifc_file: The IFC file object.
+        edges: A list of (relating object, list of related objects) pairs.
+        guids: The GlobalIds of the relationships, one per edge.
+    """
+    for guid, (parent, children) in zip(guids, edges):
+        ifc_file.create_entity(
+            'IfcRelAggregates',
+            GlobalId=guid,
+            RelatingObject=parent,
+            RelatedObjects=children
+        )
+
+
+def create_base_file() -> tuple[ifcopenshell.file,
+                                 ifcopenshell.entity_instance,
+                                 ifcopenshell.entity_instance,
+                                 ifcopenshell.entity_instance]:
+    """
+    Creates a file holding the owner history, units and geometry context shared by all examples.
+
+    The first call builds them and caches the resulting STEP text; later calls parse that text instead.
+
+    Returns:
+        tuple: (ifc file, IfcOwnerHistory, IfcUnitAssignment, IfcGeometricRepresentationContext)
+    """
+    global _TEMPLATE_CACHE
+
+    if _TEMPLATE_CACHE is None:
+        ifc_file = ifcopenshell.file(schema='IFC4')
+        ifc_file.header.file_name.time_stamp = "20250101T000000"
+
+        owner_hist = add_owner(ifc_file)
+        unit_assignment = add_units(ifc_file)
+        geom_context = add_default_geometry_context(ifc_file)
+
+        _TEMPLATE_CACHE = ifc_file.to_string()
+        return ifc_file, owner_hist, unit_assignment, geom_context
+
+    ifc_file = ifcopenshell.file.from_string(_TEMPLATE_CACHE)
+    _file_cache(ifc_file)['IfcDimensionalExponents'] = ifc_file.by_type('IfcDimensionalExponents')[0]
+    return (ifc_file,
+            ifc_file.by_type('IfcOwnerHistory')[0],
+            ifc_file.by_type('IfcUnitAssignment')[0],
+            ifc_file.by_type('IfcGeometricRepresentationContext', include_subtypes=False)[0])
+
+
 def example1() -> ifcopenshell.file:
     # set logging to debug
     logging.root.setLevel(logging.DEBUG)
 
     # initialize ifc file:
-    ifc_file = ifcopenshell.file(schema='IFC4')
-    ifc_file.header.file_name.time_stamp = "20250101T000000"
-
-    owner_hist = add_owner(ifc_file)
-    unit_assignment = add_units(ifc_file)
-    geom_context = add_default_geometry_context(ifc_file)
+    ifc_file, owner_hist, unit_assignment, geom_context = create_base_file()
     project = add_project(ifc_file, owner_hist, unit_assignment, geom_context)
 
+    # (parent, children) edges and (element, properties) pairs, emitted together at the end
+    aggregates = []
+    properties = []
+
     # site details (ignored for documentation purposes)
     site = ifc_file.createIfcSite()
     site.GlobalId = new_host_guid()
@@ -232,105 +377,73 @@ def example1() -> ifcopenshell.file:
     docset = ifc_file.createIfcAnnotation()
     docset.GlobalId = new_host_guid()
     docset.Name = 'My Document Set'
-    add_properties(ifc_file, docset, {"type": "DocumentSet"})
+    properties.append((docset, {"type": "DocumentSet"}))
 
     # connect "roots" of project
-    ifc_file.create_entity(
-        'IfcRelAggregates',
-        GlobalId=new_host_guid(),
-        RelatingObject=project,
-        RelatedObjects=[site, docset]
-    )
+    aggregates.append((project, [site, docset]))
 
     # sheet1 |> viewport1 |> view1
     sheet1 = ifc_file.createIfcAnnotation()
     sheet1.GlobalId = new_host_guid()
     sheet1.Name = 'Sample Sheet 1'
-    add_properties(ifc_file, sheet1, {"type": "Sheet"})
+    properties.append((sheet1, {"type": "Sheet"}))
 
     viewport1 = ifc_file.createIfcAnnotation()
     viewport1.GlobalId = new_host_guid()
     viewport1.Name = 'ViewPort 1'
-    add_properties(ifc_file, viewport1, {"type": "ViewPort"})
+    properties.append((viewport1, {"type": "ViewPort"}))
 
-    ifc_file.create_entity(
-        'IfcRelAggregates',
-        GlobalId=new_host_guid(),
-        RelatingObject=sheet1,
-        RelatedObjects=[viewport1]
-    )
+    aggregates.append((sheet1, [viewport1]))
 
     view1 = ifc_file.createIfcAnnotation()
     view1.GlobalId = new_host_guid()
     view1.Name = 'View 1'
-    add_properties(ifc_file, view1, {"type": "View"})
+    properties.append((view1, {"type": "View"}))
 
-    ifc_file.create_entity(
-        'IfcRelAggregates',
-        GlobalId=new_host_guid(),
-        RelatingObject=viewport1,
-        RelatedObjects=[view1]
-    )
+    aggregates.append((viewport1, [view1]))
 
     # sheet2 |> viewport2 |> view2[a,b]
     sheet2 = ifc_file.createIfcAnnotation()
     sheet2.GlobalId = new_host_guid()
     sheet2.Name = 'Sample Sheet 2'
-    add_properties(ifc_file, sheet2, {"type": "Sheet"})
+    properties.append((sheet2, {"type": "Sheet"}))
 
     viewport2a = ifc_file.createIfcAnnotation()
     viewport2a.GlobalId = new_host_guid()
     viewport2a.Name = 'ViewPort A'
-    add_properties(ifc_file, viewport2a, {"type": "ViewPort"})
+    properties.append((viewport2a, {"type": "ViewPort"}))
     view2a = ifc_file.createIfcAnnotation()
     view2a.GlobalId = new_host_guid()
     view2a.Name = 'View 2a'
-    add_properties(ifc_file, view2a, {"type": "View"})
+    properties.append((view2a, {"type": "View"}))
 
-    ifc_file.create_entity(
-        'IfcRelAggregates',
-        GlobalId=new_host_guid(),
-        RelatingObject=viewport2a,
-        RelatedObjects=[view2a]
-    )
+    aggregates.append((viewport2a, [view2a]))
 
     viewport2b = ifc_file.createIfcAnnotation()
     viewport2b.GlobalId = new_host_guid()
     viewport2b.Name = 'ViewPort B'
-    add_properties(ifc_file, viewport2b, {"type": "ViewPort"})
+    properties.append((viewport2b, {"type": "ViewPort"}))
 
     view2b = ifc_file.createIfcAnnotation()
     view2b.GlobalId = new_host_guid()
     view2b.Name = 'View 2b'
-    add_properties(ifc_file, view2b, {"type": "View"})
+    properties.append((view2b, {"type": "View"}))
 
-    ifc_file.create_entity(
-        'IfcRelAggregates',
-        GlobalId=new_host_guid(),
-        RelatingObject=viewport2b,
-        RelatedObjects=[view2b]
-    )
+    aggregates.append((viewport2b, [view2b]))
 
-    ifc_file.create_entity(
-        'IfcRelAggregates',
-        GlobalId=new_host_guid(),
-        RelatingObject=sheet2,
-        RelatedObjects=[viewport2a, viewport2b]
-    )
+    aggregates.append((sheet2, [viewport2a, viewport2b]))
 
-    ifc_file.create_entity(
-        'IfcRelAggregates',
-        GlobalId=new_host_guid(),
-        RelatingObject=docset,
-        RelatedObjects=[sheet1, sheet2]
-    )
+    aggregates.append((docset, [sheet1, sheet2]))
+
+    # all aggregation GlobalIds drawn at once
+    add_aggregates(ifc_file, aggregates, new_host_guids(len(aggregates)))
+    add_properties_bulk(ifc_file, properties)
 
     return ifc_file
 
 
 def _main():
     ifc_file = example1()
-    ifc_file = ifcopenshell.file.from_string(ifc_file.to_string())
     ifcopenshell.validate.validate(
         ifc_file,
         logger=logging.root,